@@ -1,7 +1,11 @@
-from . import request_response_pb2
-from . import request_response_pb2_grpc
-from . import service_pb2
-from . import service_pb2_grpc
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from . import request_response_pb2
+    from . import request_response_pb2_grpc
+    from . import service_pb2
+    from . import service_pb2_grpc
 
 
 __all__ = [
@@ -10,3 +14,16 @@ __all__ = [
     "service_pb2_grpc",
     "service_pb2",
 ]
+
+
+def __getattr__(name):
+    """Import the generated modules on first access (PEP 562).
+
+    Importing them registers their descriptors in the default pool and pulls
+    in grpc, which is wasted work for code that never touches the API.
+    """
+    if name in __all__:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
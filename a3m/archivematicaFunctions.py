@@ -37,6 +37,8 @@ REQUIRED_DIRECTORIES = (
 
 OPTIONAL_FILES = "README.html"
 
+NON_WORD_CHARS = re.compile(r"\W+")
+
 MANUAL_NORMALIZATION_DIRECTORIES = [
     "objects/manualNormalization/access",
     "objects/manualNormalization/preservation",
@@ -88,7 +90,7 @@ def normalizeNonDcElementName(string):
     in transfer's metadata.csv files.
     """
     # Convert non-alphanumerics to _, remove extra _ from ends of string.
-    normalized_string = re.sub(r"\W+", "_", string)
+    normalized_string = NON_WORD_CHARS.sub("_", string)
     normalized_string = normalized_string.strip("_")
     # Lower case string.
     normalized_string = normalized_string.lower()
@@ -99,18 +101,15 @@ def get_file_checksum(filename, algorithm="sha256"):
     """
     Perform a checksum on the specified file.
 
-    This function reads in files incrementally to avoid memory exhaustion.
-    See: https://stackoverflow.com/a/4213255
+    This function reads in files incrementally to avoid memory exhaustion,
+    into a single reused buffer.
 
     :param filename: The path to the file we want to check
     :param algorithm: Which algorithm to use for hashing, e.g. 'md5'
     :return: Returns a checksum string for the specified file.
     """
-    hash_ = hashlib.new(algorithm)
     with open(filename, "rb") as file_:
-        for chunk in iter(lambda: file_.read(1024 * hash_.block_size), b""):
-            hash_.update(chunk)
-    return hash_.hexdigest()
+        return hashlib.file_digest(file_, algorithm).hexdigest()
 
 
 def find_metadata_files(sip_path, filename, only_transfers=False):
@@ -191,19 +190,22 @@ def format_subdir_path(dir_path, path_prefix_to_repl):
 
 
 def div_el_to_dir_paths(div_el, parent="", include=True):
-    """Recursively extract the list of filesystem directory paths encoded in
-    <mets:div> element ``div_el``.
+    """Extract the list of filesystem directory paths encoded in <mets:div>
+    element ``div_el``, walking nested directories depth-first.
     """
     paths = []
-    path = parent
-    dir_name = div_el.get("LABEL")
-    if parent == "" and dir_name in ("metadata", "submissionDocumentation"):
-        return []
-    if include:
-        path = os.path.join(parent, dir_name)
-        paths.append(path)
-    for sub_div_el in div_el.findall('mets:div[@TYPE="Directory"]', NSMAP):
-        paths += div_el_to_dir_paths(sub_div_el, parent=path)
+    stack = [(div_el, parent, include)]
+    while stack:
+        el, parent, include = stack.pop()
+        path = parent
+        dir_name = el.get("LABEL")
+        if parent == "" and dir_name in ("metadata", "submissionDocumentation"):
+            continue
+        if include:
+            path = os.path.join(parent, dir_name)
+            paths.append(path)
+        sub_div_els = el.findall('mets:div[@TYPE="Directory"]', NSMAP)
+        stack.extend((sub_div_el, path, True) for sub_div_el in reversed(sub_div_els))
     return paths
 
 
@@ -3,6 +3,7 @@
 import shutil
 import sys
 from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from urllib.parse import urlparse
@@ -54,15 +55,19 @@ def _extract(job, path, destination):
         str(destination),
         str(path),
     ]
-    exit_code, stdout, stderr = executeOrRun("command", command, capture_output=True)
+    # unar lists every extracted entry on stdout, which we never use; leave it
+    # uncaptured so large archives do not pile up output in memory.
+    exit_code, stdout, stderr = executeOrRun("command", command, capture_output=False)
     if exit_code > 0:
         raise RetrievalError("Extraction failed, unar quit with exit code {exit_code}")
 
     output_dir = next(destination.iterdir())
 
-    # Strip leading container.
-    if len(list(output_dir.glob("*"))) == 1:
-        candidate = next(output_dir.iterdir())
+    # Strip leading container. Looking at two entries is enough to tell
+    # whether there is only one, no matter how large the directory is.
+    entries = list(islice(output_dir.glob("*"), 2))
+    if len(entries) == 1:
+        candidate = entries[0]
         if candidate.is_dir():
             return candidate
 
@@ -324,7 +324,10 @@ def getstatuteInformation(statement, parent):
 
 
 def getrightsGranted(job, statement, parent, state):
-    for granted in statement.rightsstatementrightsgranted_set.all():
+    granted_set = statement.rightsstatementrightsgranted_set.prefetch_related(
+        "restrictions", "notes"
+    )
+    for granted in granted_set:
         rightsGranted = etree.SubElement(parent, ns.premisBNS + "rightsGranted")
         etree.SubElement(rightsGranted, ns.premisBNS + "act").text = granted.act
 
@@ -27,7 +27,7 @@ def _insert_command_output(file_uuid, rule_uuid, content):
 def _get_rules(file_uuid) -> list[Rule]:
     # Check to see whether the file has already been characterized; don't try
     # to characterize it a second time if so.
-    if FPCommandOutput.objects.filter(file_id=file_uuid).count() > 0:
+    if FPCommandOutput.objects.filter(file_id=file_uuid).exists():
         return []
 
     return FPR.get_file_rules(
@@ -25,7 +25,9 @@ def call(jobs):
             if not os.path.isdir(target):
                 job.pyprint("Directory doesn't exist: ", target, file=sys.stderr)
                 os.mkdir(target)
-            if os.listdir(target) == []:
+            with os.scandir(target) as entries:
+                is_empty = next(entries, None) is None
+            if is_empty:
                 job.pyprint("Directory is empty: ", target, file=sys.stderr)
                 fileName = os.path.join(target, "submissionDocumentation.log")
                 f = open(fileName, "a")
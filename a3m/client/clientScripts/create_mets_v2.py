@@ -50,6 +50,9 @@ from .archivematicaCreateMETSMetadataCSV import parseMetadata
 from .archivematicaCreateMETSRights import archivematicaGetRights
 from .change_names import change_name
 
+# Matches refined Dublin Core terms, e.g. "description.abstract".
+REFINEMENT_REGEX = re.compile(r"\w+\.(.+)")
+
 
 class ErrorAccumulator:
     def __init__(self):
@@ -263,8 +266,6 @@ def createDmdSecsFromCSVParsedMetadata(job, metadata, state):
     # If these terms are encountered, an element with only the
     # last portion of the name will be added.
     # e.g., dc.description.abstract is mapped to <dc:abstract>
-    refinement_regex = re.compile(r"\w+\.(.+)")
-
     for key, value in metadata.items():
         if key.startswith("dc.") or key.startswith("dcterms."):
             if dc is None:
@@ -293,7 +294,7 @@ def createDmdSecsFromCSVParsedMetadata(job, metadata, state):
             elif key.startswith("dcterms."):
                 key = key.replace("dcterms.", "", 1)
                 elem_namespace = ns.dctermsBNS
-            match = re.match(refinement_regex, key)
+            match = REFINEMENT_REGEX.match(key)
             if match:
                 (key,) = match.groups()
             for v in value:
@@ -577,7 +578,7 @@ def createDigiprovMD(fileUUID, state):
     """
     ret = []
 
-    events = Event.objects.filter(file_uuid_id=fileUUID)
+    events = Event.objects.filter(file_uuid_id=fileUUID).prefetch_related("agents")
     for event_record in events:
         state.globalDigiprovMDCounter += 1
         digiprovMD = etree.Element(
@@ -1413,7 +1414,9 @@ def call(jobs):
                 # objects to a ``SIP``.
                 directories = {
                     d.currentlocation.rstrip("/"): d
-                    for d in Directory.objects.filter(sip_id=fileGroupIdentifier).all()
+                    for d in Directory.objects.filter(
+                        sip_id=fileGroupIdentifier
+                    ).prefetch_related("identifiers")
                 }
 
                 state.globalStructMapCounter += 1
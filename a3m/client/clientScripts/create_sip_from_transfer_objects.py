@@ -26,7 +26,7 @@ def main(job, transfer_id, sip_id):
         transfer_id=transfer_id,
         currentlocation__startswith="%transferDirectory%objects",
     )
-    diruuids = dir_mdls.count() > 0
+    diruuids = dir_mdls.exists()
 
     # Update model
     sip = SIP.objects.get(pk=sip_id)
@@ -1,10 +1,13 @@
 import argparse
 import csv
+import functools
 import os
+import re
 import traceback
 import uuid
 
 from django.db import transaction
+from django.db.models.functions import Length
 from django.utils import timezone
 
 from a3m import databaseFunctions
@@ -25,6 +28,9 @@ SUCCESS = 0
 RULE_FAILED = 1
 NO_RULE_FOUND = 2
 
+# Leading objects/ directory of a file location, relative to its unit
+OBJECTS_PREFIX_REGEX = re.compile(r"^%(?:transferDirectory|SIPDirectory)%objects/")
+
 
 class Executor:
     """
@@ -57,18 +63,10 @@ class Executor:
             ]
             self.replacement_dict["%outputLocation%"] = self.output_location
 
-        # Add verification and event detail commands, if they exist
+        # Verification and event detail commands, if they exist, are only
+        # built by ``execute`` once the command has succeeded
         self.verification_command = None
-        if self.fpcommand.verification_command:
-            self.verification_command = Executor(
-                self.job, self.fpcommand.verification_command, self.replacement_dict
-            )
-
         self.event_detail_command = None
-        if self.fpcommand.event_detail_command:
-            self.event_detail_command = Executor(
-                self.job, self.fpcommand.event_detail_command, self.replacement_dict
-            )
 
     def __str__(self):
         return "[COMMAND] {}\n\tExecuting: {}\n\tOutput location: {}\n".format(
@@ -100,7 +98,10 @@ class Executor:
         self.job.write_error(std_err)
         self.job.print_output("-----")
         self.job.print_output("Command exit code:", self.exit_code)
-        if self.exit_code == 0 and self.verification_command:
+        if self.exit_code == 0 and self.fpcommand.verification_command:
+            self.verification_command = Executor(
+                self.job, self.fpcommand.verification_command, self.replacement_dict
+            )
             self.job.print_output(
                 "Running verification command", self.verification_command
             )
@@ -110,7 +111,10 @@ class Executor:
             self.job.print_output("-----")
             self.job.print_output("Verification Command exit code:", self.exit_code)
 
-        if self.exit_code == 0 and self.event_detail_command:
+        if self.exit_code == 0 and self.fpcommand.event_detail_command:
+            self.event_detail_command = Executor(
+                self.job, self.fpcommand.event_detail_command, self.replacement_dict
+            )
             self.job.print_output(
                 "Running event detail command", self.event_detail_command
             )
@@ -129,36 +133,61 @@ class Executor:
 
 def get_replacement_dict(job, opts):
     """Generates values for all knows %var% replacement variables."""
-    prefix = ""
-    postfix = ""
-    output_dir = ""
     # get file name and extension
-    (directory, basename) = os.path.split(opts.file_path)
-    directory += os.path.sep  # All paths should have trailing /
-    (filename, _) = os.path.splitext(basename)
+    directory, basename = os.path.split(opts.file_path)
+    output_dir = directory + os.path.sep  # All paths should have trailing /
     postfix = "-" + opts.task_uuid
-    output_dir = directory
+    output_filename = os.path.splitext(basename)[0] + postfix
 
     # Populates the standard set of unit variables, so,
     # e.g., %fileUUID% is available
     replacement_dict = ReplacementDict.frommodel(type_="file", file_=opts.file_uuid)
-
-    output_filename = "".join([prefix, filename, postfix])
     replacement_dict.update(
         {
             "%outputDirectory%": output_dir,
-            "%prefix%": prefix,
+            "%prefix%": "",
             "%postfix%": postfix,
             "%outputFileName%": output_filename,  # does not include extension
-            "%outputFilePath%": os.path.join(
-                output_dir, output_filename
-            ),  # does not include extension
+            # does not include extension
+            "%outputFilePath%": output_dir + output_filename,
         }
     )
     return replacement_dict
 
 
-def check_manual_normalization(job, opts):
+@functools.lru_cache(maxsize=16)
+def _read_normalization_csv(path, mtime_ns):
+    """Map original filenames to preservation files listed in normalization.csv.
+
+    The file is parsed once per SIP instead of once per file being normalized;
+    ``mtime_ns`` is only used to invalidate the cache if the file changes.
+
+    Returns a ``(mapping, error)`` tuple. Parsing stops at the first row that
+    cannot be parsed or does not have three columns, in which case ``error``
+    is a ``(exception, line_num, traceback)`` tuple and ``mapping`` holds the
+    entries found before it. Any other error is raised.
+    """
+    mapping = {}
+    # use universal newline mode to support unusual newlines, like \r
+    with open(path) as csv_file:
+        reader = csv.reader(csv_file)
+        try:
+            for row in reader:
+                if not row:
+                    continue
+                if "#" in row[0]:  # ignore comments
+                    continue
+                try:
+                    original, _, preservation_file = row
+                except ValueError as err:
+                    return mapping, (err, reader.line_num, traceback.format_exc())
+                mapping.setdefault(original, preservation_file)
+        except csv.Error as err:
+            return mapping, (err, reader.line_num, traceback.format_exc())
+    return mapping, None
+
+
+def check_manual_normalization(job, opts, file_):
     """Checks for manually normalized file, returns that path or None.
 
     Checks by looking for access/preservation files for a give original file.
@@ -166,47 +195,39 @@ def check_manual_normalization(job, opts):
     Check the manualNormalization/access and manualNormalization/preservation
     directories for access and preservation files.  If a nomalization.csv
     file is specified, check there first for the mapping between original
-    file and access/preservation file."""
+    file and access/preservation file. ``file_`` is a dict with the field
+    values of the original file."""
+
+    # Most packages are not manually normalized, skip the lookups below
+    manual_normalization_dir = os.path.join(
+        opts.sip_path, "objects", "manualNormalization"
+    )
+    if not os.path.isdir(manual_normalization_dir):
+        return None
 
     # If normalization.csv provided, check there for mapping from original
     # to access/preservation file
-    normalization_csv = os.path.join(
-        opts.sip_path, "objects", "manualNormalization", "normalization.csv"
-    )
+    normalization_csv = os.path.join(manual_normalization_dir, "normalization.csv")
     # Get original name of target file, to handle changed names
-    file_ = File.objects.get(uuid=opts.file_uuid)
-    bname = file_.originallocation.replace(
-        "%transferDirectory%objects/", "", 1
-    ).replace("%SIPDirectory%objects/", "", 1)
+    bname = OBJECTS_PREFIX_REGEX.sub("", file_["originallocation"], count=1)
     if os.path.isfile(normalization_csv):
-        found = False
-        preservation_file = None
-        # use universal newline mode to support unusual newlines, like \r
-        with open(normalization_csv) as csv_file:
-            reader = csv.reader(csv_file)
-            # Search the file for an original filename that matches the one provided
-            try:
-                for row in reader:
-                    if not row:
-                        continue
-                    if "#" in row[0]:  # ignore comments
-                        continue
-                    original, _, preservation_file = row
-                    if original == bname:
-                        job.print_output(
-                            "Filename",
-                            bname,
-                            "matches entry in normalization.csv",
-                            original,
-                        )
-                        found = True
-                        break
-            except csv.Error:
-                job.print_error(
-                    "Error reading", normalization_csv, " on line", reader.line_num
-                )
-                job.print_error(traceback.format_exc())
-                return None
+        mapping, error = _read_normalization_csv(
+            normalization_csv, os.stat(normalization_csv).st_mtime_ns
+        )
+        # Search the file for an original filename that matches the one provided
+        found = bname in mapping
+        preservation_file = mapping.get(bname)
+        if found:
+            job.print_output(
+                "Filename", bname, "matches entry in normalization.csv", bname
+            )
+        elif error is not None:
+            err, line_num, tb = error
+            if not isinstance(err, csv.Error):
+                raise err
+            job.print_error("Error reading", normalization_csv, " on line", line_num)
+            job.print_error(tb)
+            return None
 
         # If we didn't find a match, let it fall through to the usual method
         if found:
@@ -239,24 +260,41 @@ def check_manual_normalization(job, opts):
         " unique file that matches SIP UUID {} and whose currentlocation"
         " value starts with this path: {}.".format(opts.sip_uuid, path)
     )
-    matches = File.objects.filter(  # removedtime = 0
-        sip=opts.sip_uuid, currentlocation__startswith=path
+    # If multiple files match, the shortest one should be the correct one. E.g.,
+    # if original is /a/b/abc.NEF then /a/b/abc.tif and /a/b/abc_1.tif will
+    # both match but /a/b/abc.tif is the correct match.
+    match = (
+        File.objects.filter(  # removedtime = 0
+            sip=opts.sip_uuid, currentlocation__startswith=path
+        )
+        .only("uuid", "currentlocation")
+        .order_by(Length("currentlocation"), "currentlocation")
+        .first()
     )
-    if not matches:
+    if match is None:
         # No file with the correct path found, assume not manually normalized
         job.print_output("No such file found.")
         return None
-    if len(matches) > 1:
-        # If multiple matches, the shortest one should be the correct one. E.g.,
-        # if original is /a/b/abc.NEF then /a/b/abc.tif and /a/b/abc_1.tif will
-        # both match but /a/b/abc.tif is the correct match.
-        job.print_output(
-            "Multiple files matching path {} found. Returning the shortest one."
-        )
-        ret = sorted(matches, key=lambda f: f.currentlocation)[0]
-        job.print_output(f"Returning file at {ret.currentlocation}")
-        return ret
-    return matches[0]
+    job.print_output(f"Returning file at {match.currentlocation}")
+    return match
+
+
+def _iter_files(top):
+    """Yield the paths of the files under ``top``, in ``os.walk`` order.
+
+    Uses the file type cached in each directory entry instead of calling
+    ``os.path.isfile`` on every path.
+    """
+    stack = [top]
+    while stack:
+        subdirs = []
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    yield entry.path
+                elif entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+        stack.extend(reversed(subdirs))
 
 
 def once_normalized(job, executor: Executor, opts, replacement_dict):
@@ -274,12 +312,7 @@ def once_normalized(job, executor: Executor, opts, replacement_dict):
     if os.path.isfile(executor.output_location):
         transcoded_files.append(executor.output_location)
     elif os.path.isdir(executor.output_location):
-        for w in os.walk(executor.output_location):
-            path, _, files = w
-            for p in files:
-                p = os.path.join(path, p)
-                if os.path.isfile(p):
-                    transcoded_files.append(p)
+        transcoded_files.extend(_iter_files(executor.output_location))
     elif executor.output_location:
         job.print_error(
             "Error - output file does not exist [", executor.output_location, "]"
@@ -290,6 +323,13 @@ def once_normalized(job, executor: Executor, opts, replacement_dict):
     event_detail_output = f'ArchivematicaFPRCommandID="{executor.fpcommand.id}"'
     if executor.event_detail_command is not None:
         event_detail_output += f"; {executor.event_detail_command.std_out}"
+
+    # Derivatives belong to the same SIP as the original file, so they share
+    # its agents. Look them up once instead of once per event.
+    agents = list(databaseFunctions.getAMAgentsForFile(opts.file_uuid))
+
+    format_versions = []
+    file_ids = []
     for ef in transcoded_files:
         today = timezone.now()
         output_file_uuid = opts.task_uuid  # Match the UUID on disk
@@ -304,6 +344,7 @@ def once_normalized(job, executor: Executor, opts, replacement_dict):
             today,  # Current date
             sourceType="creation",
             use="preservation",
+            agents=agents,
         )
 
         # Calculate new file checksum
@@ -312,6 +353,7 @@ def once_normalized(job, executor: Executor, opts, replacement_dict):
             ef,  # File path
             today,  # Date
             str(uuid.uuid4()),  # Event UUID, new UUID
+            agents=agents,
         )
 
         # Add derivation link and associated event
@@ -325,6 +367,7 @@ def once_normalized(job, executor: Executor, opts, replacement_dict):
             event_detail_output=event_detail_output,
             outcome_detail_note=path_relative_to_sip,
             today=today,
+            agents=agents,
         )
 
         if executor.fpcommand.output_format is None:
@@ -334,15 +377,22 @@ def once_normalized(job, executor: Executor, opts, replacement_dict):
 
         # Use the format info from the normalization command
         # to save identification into the DB
-        FileFormatVersion.objects.create(
-            file_uuid_id=output_file_uuid,
-            format_version_id=executor.fpcommand.output_format.id,
+        format_versions.append(
+            FileFormatVersion(
+                file_uuid_id=output_file_uuid,
+                format_version_id=executor.fpcommand.output_format.id,
+            )
         )
-        FileID.objects.create(
-            file_id=output_file_uuid,
-            format_name=executor.fpcommand.output_format.format.description,
+        file_ids.append(
+            FileID(
+                file_id=output_file_uuid,
+                format_name=executor.fpcommand.output_format.format.description,
+            )
         )
 
+    FileFormatVersion.objects.bulk_create(format_versions)
+    FileID.objects.bulk_create(file_ids)
+
 
 def once_normalized_callback(job):
     def wrapper(*args):
@@ -358,6 +408,7 @@ def insert_derivation_event(
     event_detail_output,
     outcome_detail_note,
     today=None,
+    agents=None,
 ):
     """Add the derivation link for preservation files and the event."""
     if today is None:
@@ -371,6 +422,7 @@ def insert_derivation_event(
         eventDetail=event_detail_output,
         eventOutcome="",
         eventOutcomeDetailNote=outcome_detail_note or "",
+        agents=agents,
     )
 
     # Add linking information between files
@@ -384,36 +436,45 @@ def insert_derivation_event(
 def main(job, opts):
     """Find and execute normalization commands on input file."""
     setup_dicts()
-
-    # Find the file and itss FormatVersion (file identification)
-    try:
-        file_ = File.objects.get(uuid=opts.file_uuid)
-    except File.DoesNotExist:
+    file_name = os.path.basename(opts.file_path)
+
+    # Find the file and its FormatVersions (file identification), joined in a
+    # single query that returns a row per identification
+    rows = list(
+        File.objects.filter(uuid=opts.file_uuid).values(
+            "uuid",
+            "currentlocation",
+            "originallocation",
+            "filegrpuse",
+            "fileformatversion__format_version_id",
+        )
+    )
+    if not rows:
         job.print_error("File with uuid", opts.file_uuid, "does not exist in database.")
         return NO_RULE_FOUND
-    job.print_output("File found:", file_.uuid, file_.currentlocation)
+    file_ = rows[0]
+    job.print_output("File found:", file_["uuid"], file_["currentlocation"])
 
     # Unless normalization file group use is submissionDocumentation, skip the
     # submissionDocumentation directory
+    current_location = file_["currentlocation"]
     if (
         opts.normalize_file_grp_use != "submissionDocumentation"
-        and file_.currentlocation.startswith(
-            "%SIPDirectory%objects/submissionDocumentation"
-        )
+        and current_location.startswith("%SIPDirectory%objects/submissionDocumentation")
     ):
         job.print_output(
             "File",
-            os.path.basename(opts.file_path),
+            file_name,
             "in objects/submissionDocumentation, skipping",
         )
         return SUCCESS
 
     # Only normalize files where the file's group use and normalize group use match
-    if file_.filegrpuse != opts.normalize_file_grp_use:
+    if file_["filegrpuse"] != opts.normalize_file_grp_use:
         job.print_output(
-            os.path.basename(opts.file_path),
+            file_name,
             "is file group usage",
-            file_.filegrpuse,
+            file_["filegrpuse"],
             "instead of ",
             opts.normalize_file_grp_use,
             " - skipping",
@@ -421,10 +482,10 @@ def main(job, opts):
         return SUCCESS
 
     # If a file has been manually normalized, skip it
-    manually_normalized_file = check_manual_normalization(job, opts)
+    manually_normalized_file = check_manual_normalization(job, opts, file_)
     if manually_normalized_file:
         job.print_output(
-            os.path.basename(opts.file_path),
+            file_name,
             "was already manually normalized into",
             manually_normalized_file.currentlocation,
         )
@@ -438,12 +499,19 @@ def main(job, opts):
         )
         return SUCCESS
 
-    if not file_.currentlocation:
+    if not file_["currentlocation"]:
         job.print_output("Not normalizing file because its path can't be found.")
         return NO_RULE_FOUND
-    path = os.path.basename(file_.currentlocation)
-
-    rules = FPR.get_file_rules(opts.file_uuid, purpose=RulePurpose.PRESERVATION)
+    path = os.path.basename(file_["currentlocation"])
+
+    rules = FPR.get_format_version_rules(
+        [
+            row["fileformatversion__format_version_id"]
+            for row in rows
+            if row["fileformatversion__format_version_id"] is not None
+        ],
+        RulePurpose.PRESERVATION,
+    )
     if not rules:
         job.print_output(
             f"Not normalizing {path} - no rule or default rule found to normalize for preservation"
@@ -460,8 +528,7 @@ def main(job, opts):
         job.print_error(f"Command {command.description} failed!")
         return RULE_FAILED
 
-    path = os.path.basename(opts.file_path)
-    job.print_output(f"Successfully normalized {path} for preservation")
+    job.print_output(f"Successfully normalized {file_name} for preservation")
     return SUCCESS
 
 
@@ -478,12 +545,12 @@ def call(jobs):
         help='"service", "original", "submissionDocumentation", etc',
     )
 
-    with transaction.atomic():
-        for job in jobs:
-            with job.JobContext():
-                opts = parser.parse_args(job.args[1:])
-                try:
+    for job in jobs:
+        with job.JobContext():
+            opts = parser.parse_args(job.args[1:])
+            try:
+                with transaction.atomic():
                     job.set_status(main(job, opts))
-                except Exception as e:
-                    job.print_error(str(e))
-                    job.set_status(1)
+            except Exception as e:
+                job.print_error(str(e))
+                job.set_status(1)
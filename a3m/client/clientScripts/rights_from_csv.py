@@ -21,6 +21,12 @@ from django.db import transaction
 
 from a3m.main import models
 
+GRANT_RESTRICTIONS = frozenset(("disallow", "conditional", "allow"))
+
+RIGHTS_BASES = frozenset(
+    value for value, _ in models.RightsStatement.RIGHTS_BASIS_CHOICES
+)
+
 
 class RightsRowException(Exception):
     def __init__(self, message, reader):
@@ -54,7 +60,7 @@ class RightCsvReader:
         "doc_id_role",
     ]
 
-    allowed_column_names = optional_column_names + required_column_names
+    allowed_column_names = frozenset(optional_column_names + required_column_names)
 
     def __init__(self, job, transfer_uuid, rights_csv_filepath):
         """Initialize parser."""
@@ -93,11 +99,7 @@ class RightCsvReader:
 
         # If restriction specified, ensure it has an allowed value
         restriction = self.column_value("grant_restriction")
-        if restriction and restriction.lower() not in [
-            "disallow",
-            "conditional",
-            "allow",
-        ]:
+        if restriction and restriction.lower() not in GRANT_RESTRICTIONS:
             raise RightsRowException(
                 "The value of element restriction must be: 'Allow', 'Disallow', or 'Conditional'",
                 self,
@@ -152,7 +154,7 @@ class RightCsvReader:
         """Generate rights statement."""
         basis = self.column_value("basis").lower().capitalize()
 
-        if basis not in dict(models.RightsStatement.RIGHTS_BASIS_CHOICES):
+        if basis not in RIGHTS_BASES:
             raise RightsRowException(f"Invalid basis: {basis}", self)
 
         # Get file data
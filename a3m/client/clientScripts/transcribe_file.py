@@ -69,7 +69,9 @@ def fetch_rules_for(file_obj) -> list[Rule]:
 
 
 def fetch_rules_for_derivatives(file_obj) -> tuple[File | None, list[Rule]]:
-    derivs = Derivation.objects.filter(source_file=file_obj)
+    derivs = Derivation.objects.filter(source_file=file_obj).select_related(
+        "derived_file"
+    )
     for deriv in derivs:
         derived_file = deriv.derived_file
         rules = fetch_rules_for(derived_file)
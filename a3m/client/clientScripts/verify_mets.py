@@ -5,6 +5,7 @@ far is to verify the validity of custom structmaps included with transfers and
 supplied on ingest after appraisal.
 """
 
+import functools
 import os
 
 from lxml import etree
@@ -16,6 +17,20 @@ class VerifyMETSException(Exception):
     """Exception to raise if METS validation fails."""
 
 
+@functools.cache
+def _get_xmlschema(xsd_path):
+    """Parse and compile the XML schema once per process.
+
+    The METS schema imports several others, which makes building it far more
+    expensive than validating the small structMap documents we check with it.
+    """
+    return etree.XMLSchema(
+        etree.parse(  # noqa S320
+            xsd_path, etree.XMLParser(resolve_entities=False, no_network=True)
+        )
+    )
+
+
 def call(jobs):
     """Primary entry point for this script."""
     for job in jobs:
@@ -29,11 +44,7 @@ def call(jobs):
                 return
             if not os.path.isfile(mets_xsd):
                 raise VerifyMETSException
-            xmlschema = etree.XMLSchema(
-                etree.parse(  # noqa S320
-                    mets_xsd, etree.XMLParser(resolve_entities=False, no_network=True)
-                )
-            )
+            xmlschema = _get_xmlschema(mets_xsd)
             # Raise an exception if not valid, e.g. etree.DocumentInvalid
             # otherwise, the document validates correctly and returns.
             xmlschema.assertValid(
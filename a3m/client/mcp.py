@@ -62,6 +62,7 @@ from a3m.client.job import Job
 from a3m.databaseFunctions import auto_close_db
 from a3m.databaseFunctions import getUTCDate
 from a3m.databaseFunctions import retryOnFailure
+from a3m.main.models import BULK_CREATE_BATCH_SIZE
 from a3m.main.models import Task
 
 logger = logging.getLogger(__name__)
@@ -138,10 +139,9 @@ def fail_all_tasks(batch_payload, reason):
     try:
 
         def fail_all_tasks_callback():
-            for task_uuid in tasks:
-                Task.objects.filter(taskuuid=task_uuid).update(
-                    stderror=str(reason), exitcode=1, endtime=getUTCDate()
-                )
+            Task.objects.filter(taskuuid__in=list(tasks)).update(
+                stderror=str(reason), exitcode=1, endtime=getUTCDate()
+            )
 
         retryOnFailure("Fail all tasks", fail_all_tasks_callback)
     except Exception as e:
@@ -165,24 +165,28 @@ def execute_command(task_name: str, batch_payload):
 
             def write_task_results_callback():
                 with transaction.atomic():
+                    # Tasks are updated in bulk, split by whether their
+                    # output is stored so that each group is one statement.
+                    tasks_with_output = []
+                    tasks_without_output = []
                     for job in jobs:
                         logger.debug("Completed job: %s\n", job.dump())
 
                         exit_code = job.get_exit_code()
                         end_time = getUTCDate()
 
-                        kwargs = {"exitcode": exit_code, "endtime": end_time}
+                        task = Task(
+                            taskuuid=job.UUID, exitcode=exit_code, endtime=end_time
+                        )
                         if (
                             django_settings.CAPTURE_CLIENT_SCRIPT_OUTPUT
-                            or kwargs["exitcode"] > 0
+                            or exit_code > 0
                         ):
-                            kwargs.update(
-                                {
-                                    "stdout": job.get_stdout(),
-                                    "stderror": job.get_stderr(),
-                                }
-                            )
-                        Task.objects.filter(taskuuid=job.UUID).update(**kwargs)
+                            task.stdout = job.get_stdout()
+                            task.stderror = job.get_stderr()
+                            tasks_with_output.append(task)
+                        else:
+                            tasks_without_output.append(task)
 
                         results[job.UUID] = {
                             "exitCode": exit_code,
@@ -203,6 +207,17 @@ def execute_command(task_name: str, batch_payload):
                         else:
                             metrics.job_failed(task_name)
 
+                    Task.objects.bulk_update(
+                        tasks_without_output,
+                        ["exitcode", "endtime"],
+                        batch_size=BULK_CREATE_BATCH_SIZE,
+                    )
+                    Task.objects.bulk_update(
+                        tasks_with_output,
+                        ["exitcode", "endtime", "stdout", "stderror"],
+                        batch_size=BULK_CREATE_BATCH_SIZE,
+                    )
+
             retryOnFailure("Write task results", write_task_results_callback)
 
             return {"task_results": results}
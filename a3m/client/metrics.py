@@ -7,6 +7,8 @@ import importlib
 import pkgutil
 
 from django.conf import settings
+from django.db.models import Count
+from django.db.models import Min
 from django.db.models import Sum
 from django.utils import timezone
 from prometheus_client import Counter
@@ -121,74 +123,119 @@ aip_size_histogram = Histogram(
 # There's no central place to pull these constants from currently
 PACKAGE_FAILURE_TYPES = ("fail", "reject")
 
+# SIPs whose AIP has been recorded by aip_stored, so that running the storage
+# task again for the same SIP does not count it twice.
+_stored_sips = set()
+
 
 def skip_if_prometheus_disabled(func):
+    # The setting does not change while the process runs, so check it once
+    # instead of on every call.
+    if settings.PROMETHEUS_ENABLED:
+        return func
+
     @functools.wraps(func)
     def wrapper(*args, **kwds):
-        if settings.PROMETHEUS_ENABLED:
-            return func(*args, **kwds)
         return None
 
     return wrapper
 
 
+@functools.cache
+def _job_metrics(script_name):
+    """Return the children of the per-script job metrics.
+
+    ``labels`` takes a lock and hashes the label values on every call, so the
+    children are looked up once per script instead of once per job.
+    """
+    return (
+        job_counter.labels(script_name=script_name),
+        job_processed_timestamp.labels(script_name=script_name),
+        job_error_counter.labels(script_name=script_name),
+        job_error_timestamp.labels(script_name=script_name),
+    )
+
+
+@functools.cache
+def _transfer_error_metrics(failure_type):
+    """Return the children of the transfer failure metrics for a failure type."""
+    return (
+        transfer_error_counter.labels(failure_type=failure_type),
+        transfer_error_timestamp.labels(failure_type=failure_type),
+    )
+
+
+@functools.cache
+def _sip_error_metrics(failure_type):
+    """Return the children of the SIP failure metrics for a failure type."""
+    return (
+        sip_error_counter.labels(failure_type=failure_type),
+        sip_error_timestamp.labels(failure_type=failure_type),
+    )
+
+
+@functools.cache
+def _get_script_names():
+    """Return the names of the client script modules that can run jobs."""
+    names = []
+    for _, modname, is_pkg in pkgutil.iter_modules(clientScripts.__path__):
+        if is_pkg:
+            continue
+        module = importlib.import_module(f"{clientScripts.__name__}.{modname}")
+        if not hasattr(module, "call"):
+            continue
+        names.append(modname)
+    return tuple(names)
+
+
+@skip_if_prometheus_disabled
 def init_counter_labels():
     # Zero our counters to start, by intializing all labels. Non-zero starting points
     # cause problems when measuring rates.
 
-    for _, modname, is_pkg in pkgutil.iter_modules(clientScripts.__path__):
-        if not is_pkg:
-            continue
-        module = importlib.import_module(modname)
-        if "call" not in module:
-            raise Exception()
-        modname = modname.split(".")[-1]
-        print(modname)
-        job_counter.labels(script_name=modname)
-        job_processed_timestamp.labels(script_name=modname)
-        job_error_counter.labels(script_name=modname)
-        job_error_timestamp.labels(script_name=modname)
+    for modname in _get_script_names():
+        _job_metrics(modname)
         task_execution_time_histogram.labels(script_name=modname)
 
     for failure_type in PACKAGE_FAILURE_TYPES:
-        transfer_error_counter.labels(failure_type=failure_type)
-        transfer_error_timestamp.labels(failure_type=failure_type)
-
-    for failure_type in PACKAGE_FAILURE_TYPES:
-        sip_error_counter.labels(failure_type=failure_type)
-        sip_error_timestamp.labels(failure_type=failure_type)
+        _transfer_error_metrics(failure_type)
+        _sip_error_metrics(failure_type)
 
 
 @skip_if_prometheus_disabled
 def job_completed(script_name):
-    job_counter.labels(script_name=script_name).inc()
-    job_processed_timestamp.labels(script_name=script_name).set_to_current_time()
+    counter, processed_timestamp, _, _ = _job_metrics(script_name)
+    counter.inc()
+    processed_timestamp.set_to_current_time()
 
 
 @skip_if_prometheus_disabled
 def job_failed(script_name):
-    job_counter.labels(script_name=script_name).inc()
-    job_error_counter.labels(script_name=script_name).inc()
-    job_error_timestamp.labels(script_name=script_name).set_to_current_time()
+    counter, _, error_counter, error_timestamp = _job_metrics(script_name)
+    counter.inc()
+    error_counter.inc()
+    error_timestamp.set_to_current_time()
 
 
 @skip_if_prometheus_disabled
 def aip_stored(sip_uuid, size):
+    if str(sip_uuid) in _stored_sips:
+        return
+    _stored_sips.add(str(sip_uuid))
+
+    now = timezone.now()
     aips_stored_counter.inc()
-    aips_stored_timestamp.set_to_current_time()
+    aips_stored_timestamp.set(now.timestamp())
     aip_size_histogram.observe(size)
 
-    try:
-        earliest_file = File.objects.filter(sip_id=sip_uuid).earliest("enteredsystem")
-    except File.DoesNotExist:
-        pass
-    else:
-        duration = (timezone.now() - earliest_file.enteredsystem).total_seconds()
+    files = File.objects.filter(sip_id=sip_uuid).aggregate(
+        earliest=Min("enteredsystem"), total=Count("uuid")
+    )
+    if files["earliest"] is not None:
+        duration = (now - files["earliest"]).total_seconds()
         aip_processing_time_histogram.observe(duration)
 
-    # We do two queries here, as we may not have format information for everything
-    total_file_count = File.objects.filter(sip_id=sip_uuid).count()
-    aip_files_stored_histogram.observe(total_file_count)
+    aip_files_stored_histogram.observe(files["total"])
 
 
 @skip_if_prometheus_disabled
@@ -199,26 +246,28 @@ def transfer_started():
 
 @skip_if_prometheus_disabled
 def transfer_completed(transfer_uuid):
-    try:
-        transfer = Transfer.objects.get(uuid=transfer_uuid)
-    except Transfer.DoesNotExist:
+    # Check the transfer exists and total its files in a single query
+    files = (
+        Transfer.objects.filter(uuid=transfer_uuid)
+        .annotate(count=Count("file"), total_size=Sum("file__size"))
+        .values("count", "total_size")
+        .first()
+    )
+    if files is None:
         return
 
     transfer_completed_counter.inc()
     transfer_completed_timestamp.set_to_current_time()
 
-    file_queryset = File.objects.filter(transfer=transfer)
-    file_count = file_queryset.count()
-    transfer_files_histogram.observe(file_count)
-
-    transfer_size = file_queryset.aggregate(total_size=Sum("size"))
-    transfer_size_histogram.observe(transfer_size["total_size"])
+    transfer_files_histogram.observe(files["count"])
+    transfer_size_histogram.observe(files["total_size"] or 0)
 
 
 @skip_if_prometheus_disabled
 def transfer_failed(failure_type):
-    transfer_error_counter.labels(failure_type=failure_type).inc()
-    transfer_error_timestamp.labels(failure_type=failure_type).set_to_current_time()
+    counter, timestamp = _transfer_error_metrics(failure_type)
+    counter.inc()
+    timestamp.set_to_current_time()
 
 
 @skip_if_prometheus_disabled
@@ -229,5 +278,6 @@ def sip_started():
 
 @skip_if_prometheus_disabled
 def sip_failed(failure_type):
-    sip_error_counter.labels(failure_type=failure_type).inc()
-    sip_error_timestamp.labels(failure_type=failure_type).set_to_current_time()
+    counter, timestamp = _sip_error_metrics(failure_type)
+    counter.inc()
+    timestamp.set_to_current_time()
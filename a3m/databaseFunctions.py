@@ -116,7 +116,7 @@ def getAMAgentsForFile(fileUUID):
     :returns: A list of Agent IDs
     """
     try:
-        f = File.objects.get(uuid=fileUUID)
+        f = File.objects.select_related("sip", "transfer").get(uuid=fileUUID)
     except File.DoesNotExist:
         logger.warning(
             "File with UUID %s does not exist in database; unable to fetch Agents",
@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with Archivematica.  If not, see <http://www.gnu.org/licenses/>.
 import ast
+import functools
 import os
 import re
 
@@ -24,6 +25,14 @@ from a3m.main import models
 
 config = {}
 
+UPPERCASE_RUN = re.compile(r"([A-Z]+)")
+
+
+@functools.lru_cache(maxsize=64)
+def _keys_pattern(keys):
+    """Compile an alternation matching any of ``keys``, tried in order."""
+    return re.compile("|".join(re.escape(key) for key in keys))
+
 
 def setup_dicts():
     config["shared_directory"] = django_settings.SHARED_DIRECTORY
@@ -181,12 +190,17 @@ class ReplacementDict(dict):
         >>> rd = ReplacementDict({"$foo": "bar"})
         >>> rd.replace('The value of the foo variable is: $foo')
         ['The value of the foo variable is: bar']
+
+        Each string is scanned once, so replaced values are not themselves
+        searched for keys.
         """
+        if not self:
+            return list(strings)
+        pattern = _keys_pattern(tuple(self))
         ret = []
         for orig in strings:
             if orig is not None:
-                for key, value in self.items():
-                    orig = orig.replace(key, value)
+                orig = pattern.sub(lambda match: self[match.group(0)], orig)
             ret.append(orig)
         return ret
 
@@ -202,7 +216,7 @@ class ReplacementDict(dict):
         """
         args = []
         for key, value in self.items():
-            optname = re.sub(r"([A-Z]+)", r"-\1", key[1:-1]).lower()
+            optname = UPPERCASE_RUN.sub(r"-\1", key[1:-1]).lower()
             opt = f"--{optname}={value}"
             args.append(opt)
 
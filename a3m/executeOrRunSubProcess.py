@@ -114,15 +114,14 @@ def launchSubProcess(
             stdOut, stdError = p.communicate(input=communicate_input)
         else:
             # Ignore the stdout of the subprocess, capturing only stderr
-            with open(os.devnull, "w") as devnull:
-                p = subprocess.Popen(
-                    command,  # noqa S603
-                    stdin=stdin_pipe,
-                    env=my_env,
-                    stdout=devnull,
-                    stderr=subprocess.PIPE,
-                )
-                __, stdError = p.communicate(input=communicate_input)
+            p = subprocess.Popen(
+                command,  # noqa S603
+                stdin=stdin_pipe,
+                env=my_env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+            __, stdError = p.communicate(input=communicate_input)
         retcode = p.returncode
         # If we are not capturing output and the subprocess has succeeded, set
         # its stderr to the empty string.
@@ -48,13 +48,15 @@ def updateSizeAndChecksum(
     checksum=None,
     checksumType=None,
     add_event=True,
+    agents=None,
 ):
     """
     Update a File with its size, checksum and checksum type. These are
     parameters that can be either generated or provided via keywords.
 
     Finally, insert the corresponding Event. This behavior can be cancelled
-    using the boolean keyword 'add_event'.
+    using the boolean keyword 'add_event'. The event agents are looked up
+    unless provided via 'agents'.
     """
     fileSize, checksum, checksumType = get_size_and_checksum(
         file_path=filePath,
@@ -74,6 +76,7 @@ def updateSizeAndChecksum(
             eventDateTime=date,
             eventDetail=f'program="python"; module="hashlib.{checksumType}()"',
             eventOutcomeDetailNote=checksum,
+            agents=agents,
         )
 
 
@@ -132,6 +135,7 @@ def addFileToSIP(
     date,
     sourceType="ingestion",
     use="original",
+    agents=None,
 ):
     insertIntoFiles(fileUUID, filePathRelativeToSIP, date, sipUUID=sipUUID, use=use)
     insertIntoEvents(
@@ -141,6 +145,7 @@ def addFileToSIP(
         eventDetail="",
         eventOutcome="",
         eventOutcomeDetailNote="",
+        agents=agents,
     )
 
 
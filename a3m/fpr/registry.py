@@ -37,6 +37,7 @@ import json
 import uuid
 from abc import ABC
 from abc import abstractmethod
+from collections.abc import Iterable
 from datetime import datetime
 from enum import Enum
 from importlib.resources import files
@@ -298,6 +299,9 @@ class JSONBackend(Backend):
     replaced_commands: dict[uuid.UUID, uuid.UUID]
     replaced_rules: dict[uuid.UUID, uuid.UUID]
 
+    # Rules in service indexed by format version and purpose.
+    rules_in_service: dict[tuple[uuid.UUID, RulePurpose], list[Rule]]
+
     def __init__(self, blob):
         self._load(json.loads(blob))
 
@@ -429,6 +433,13 @@ class JSONBackend(Backend):
                     self.rules[id] = rule
         self.replaced_rules = get_replaced_objects(self.rules)
 
+        # Index the rules in service once, rules are looked up for every file.
+        self.rules_in_service = {}
+        for rule in self.rules.values():
+            if rule.enabled and rule.id not in self.replaced_rules:
+                key = (rule.format.id, rule.purpose)
+                self.rules_in_service.setdefault(key, []).append(rule)
+
     def get_format_version_by_id(self, id: uuid.UUID) -> FormatVersion | None:
         version = self.versions.get(id)
         if (
@@ -455,16 +466,10 @@ class JSONBackend(Backend):
     def get_rules(
         self, format_version_id: uuid.UUID, purpose: RulePurpose
     ) -> list[Rule]:
-        rules: list[Rule] = []
         format_version = self.versions.get(format_version_id)
         if not format_version:
             raise ValueError(f"Format version f{format_version_id} not found.")
-        for rule in self.rules.values():
-            if rule.format.id == format_version_id:
-                if rule.purpose == purpose:
-                    if rule.enabled and rule.id not in self.replaced_rules:
-                        rules.append(rule)
-        return rules
+        return list(self.rules_in_service.get((format_version_id, purpose), ()))
 
 
 def convert_django_date_to_datetime(date: str) -> datetime:
@@ -529,6 +534,22 @@ class Registry:
         It omits rules not in service."""
         return self.backend.get_rules(convert_to_uuid(format_version_id), purpose)
 
+    def _get_format_version_ids(self, file_uuid: str) -> list[uuid.UUID]:
+        """Return the format versions a file is identified as.
+
+        The file and its identifications are read in a single query. It raises
+        ``File.DoesNotExist`` when the file is not found.
+        """
+        model = self._file_model()
+        rows = list(
+            model.objects.filter(pk=file_uuid).values_list(  # type: ignore
+                "fileformatversion__format_version_id", flat=True
+            )
+        )
+        if not rows:
+            raise model.DoesNotExist(f"File {file_uuid} does not exist.")  # type: ignore
+        return [item for item in rows if item is not None]
+
     def get_file_rules(
         self, file: uuid.UUID | str | File, purpose: RulePurpose | str, fallback=False
     ) -> list[Rule]:
@@ -538,21 +559,32 @@ class Registry:
 
         TODO: refactor as method of the File mode, should also typing and circular import issues.
         """
-        result: list[Rule] = []
-        if isinstance(purpose, str):
-            purpose = RulePurpose(purpose)
-        file_obj: File
+        format_version_ids: Iterable[uuid.UUID]
         if str(type(file).__name__) == File:
-            file_obj = file  # type: ignore
-        elif isinstance(file, uuid.UUID):
-            file_obj = self._file_model().objects.get(pk=str(file))
-        elif isinstance(file, str):
-            file_obj = self._file_model().objects.get(pk=file)
+            format_version_ids = file.fileformatversion_set.values_list(  # type: ignore
+                "format_version_id", flat=True
+            )
+        elif isinstance(file, (uuid.UUID, str)):
+            format_version_ids = self._get_format_version_ids(str(file))
         else:
             raise ValueError
-        for format_version_id in file_obj.fileformatversion_set.values_list(
-            "format_version_id", flat=True
-        ):
+        return self.get_format_version_rules(format_version_ids, purpose, fallback)
+
+    def get_format_version_rules(
+        self,
+        format_version_ids: Iterable[uuid.UUID],
+        purpose: RulePurpose | str,
+        fallback=False,
+    ) -> list[Rule]:
+        """Return the rules for the given format versions and rule purpose.
+
+        Use it when the file identification has already been fetched. It omits
+        rules not in service.
+        """
+        result: list[Rule] = []
+        if isinstance(purpose, str):
+            purpose = RulePurpose(purpose)
+        for format_version_id in format_version_ids:
             rules = self.get_rules(format_version_id, purpose)
             if len(rules):
                 result.extend(rules)
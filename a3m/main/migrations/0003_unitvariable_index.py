@@ -0,0 +1,21 @@
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [("main", "0002_initial_data")]
+
+    operations = [
+        migrations.AlterField(
+            model_name="unitvariable",
+            name="variable",
+            field=models.CharField(db_column="variable", max_length=255, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="unitvariable",
+            index=models.Index(
+                fields=["unituuid", "unittype", "variable"],
+                name="UnitVariabl_unitUUI_f6214b_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [("main", "0003_unitvariable_index")]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="job",
+            name="Jobs_SIPUUID_cf4b11_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="job",
+            name="Jobs_SIPUUID_658a37_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="job",
+            name="Jobs_jobType_4a3346_idx",
+        ),
+        migrations.AlterField(
+            model_name="job",
+            name="sipuuid",
+            field=models.CharField(db_column="SIPUUID", max_length=36),
+        ),
+    ]
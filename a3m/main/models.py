@@ -17,14 +17,17 @@
 # This Django model module was auto-generated and then updated manually
 # Needs some cleanups, make sure each model has its primary_key=True
 # Feel free to rename the models, but don't rename db_table values or field names.
+import functools
 import logging
 import re
 import uuid
 from collections.abc import Iterator
 from collections.abc import Sequence
+from itertools import islice
 from typing import TYPE_CHECKING
 
 from django.db import models
+from django.db import transaction
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
@@ -231,10 +234,13 @@ class Derivation(models.Model):
 class UnitHiddenManager(models.Manager):
     def is_hidden(self, uuid):
         """Return True if the unit (SIP, Transfer) with uuid is hidden."""
-        try:
-            return self.get_queryset().get(uuid=uuid).hidden
-        except:
-            return False
+        hidden = (
+            self.get_queryset()
+            .filter(uuid=uuid)
+            .values_list("hidden", flat=True)
+            .first()
+        )
+        return bool(hidden)
 
 
 class SIP(models.Model):
@@ -269,15 +275,13 @@ class SIP(models.Model):
 
     @property
     def transfer_id(self):
-        try:
-            unit_variable = UnitVariable.objects.get(
+        return (
+            UnitVariable.objects.filter(
                 unittype="SIP", unituuid=self.uuid, variable="transferID"
             )
-        except UnitVariable.DoesNotExist:
-            result = None
-        else:
-            result = unit_variable.variablevalue
-        return result
+            .values_list("variablevalue", flat=True)
+            .first()
+        )
 
     @transfer_id.setter
     def transfer_id(self, transfer_id):
@@ -288,10 +292,13 @@ class SIP(models.Model):
 
 class TransferManager(models.Manager):
     def is_hidden(self, uuid):
-        try:
-            return Transfer.objects.get(uuid__exact=uuid).hidden is True
-        except:
-            return False
+        hidden = (
+            self.get_queryset()
+            .filter(uuid=uuid)
+            .values_list("hidden", flat=True)
+            .first()
+        )
+        return hidden is True
 
 
 class Transfer(models.Model):
@@ -500,25 +507,27 @@ class Directory(models.Model):
         expected to be a dict instance where the ``originallocation`` field is
         optional. The ``originallocation`` but can be set according to the
         requirements of the PREMIS record that eventually needs to be created
-        using this model.
+        using this model. ``dir_paths_uuids`` can be any iterable, e.g. a
+        generator.
         """
-        unit_type = {"transfer": "transfer"}.get(unit_type, "sip")
-        paths = []
-        for dir_ in dir_paths_uuids:
-            dir_path = dir_.get("currentLocation")
-            dir_uuid = dir_.get("uuid")
-            orig_path = dir_.get("originalLocation", dir_path)
-            paths.append(
-                cls(
-                    **{
-                        "uuid": dir_uuid,
-                        unit_type: unit_mdl,
-                        "originallocation": orig_path,
-                        "currentlocation": dir_path,
-                    }
-                )
+        unit_type = "transfer" if unit_type == "transfer" else "sip"
+        paths = (
+            cls(
+                **{
+                    "uuid": dir_.get("uuid"),
+                    unit_type: unit_mdl,
+                    "originallocation": dir_.get(
+                        "originalLocation", dir_.get("currentLocation")
+                    ),
+                    "currentlocation": dir_.get("currentLocation"),
+                }
             )
-        return cls.objects.bulk_create(paths)
+            for dir_ in dir_paths_uuids
+        )
+        # Insert in batches so that large units are never fully materialized.
+        with transaction.atomic():
+            while batch := list(islice(paths, BULK_CREATE_BATCH_SIZE)):
+                cls.objects.bulk_create(batch)
 
 
 class FileFormatVersion(models.Model):
@@ -561,6 +570,12 @@ class JobQuerySet(models.QuerySet):
         return job.get_directory_name()
 
 
+UUID_SUFFIXED_DIRECTORY_REGEX = re.compile(
+    r"^.*/(?P<directory>.*)-" r"[\w]{8}(-[\w]{4})" r"{3}-[\w]{12}[/]{0,1}$"
+)
+TRAILING_SLASH_DIRECTORY_REGEX = re.compile(r"^.*/(?P<directory>.*)/$")
+
+
 class Job(models.Model):
     jobuuid = models.UUIDField(
         db_column="jobUUID", primary_key=True, default=uuid.uuid4
@@ -571,9 +586,8 @@ class Job(models.Model):
         db_column="createdTimeDec", max_digits=26, decimal_places=10, default=0.0
     )
     directory = models.TextField(blank=True)
-    sipuuid = models.CharField(
-        max_length=36, db_column="SIPUUID", db_index=True
-    )  # Foreign key to SIPs or Transfers
+    # Foreign key to SIPs or Transfers
+    sipuuid = models.CharField(max_length=36, db_column="SIPUUID")
     unittype = models.CharField(max_length=50, db_column="unitType", blank=True)
     STATUS_UNKNOWN = 0
     STATUS_COMPLETED_SUCCESSFULLY = 1
@@ -602,36 +616,16 @@ class Job(models.Model):
         db_table = "Jobs"
         indexes = [
             models.Index(fields=["sipuuid", "createdtime", "createdtimedec"]),
-            models.Index(
-                fields=["sipuuid", "jobtype", "createdtime", "createdtimedec"]
-            ),
-            models.Index(
-                fields=[
-                    "sipuuid",
-                    "currentstep",
-                    "microservicegroup",
-                    "microservicechainlink",
-                ]
-            ),
-            models.Index(fields=["jobtype", "currentstep"]),
         ]
 
     def get_directory_name(self, default=None):
         if not self.directory:
             return self.sipuuid
-        try:
-            return re.search(
-                r"^.*/(?P<directory>.*)-" r"[\w]{8}(-[\w]{4})" r"{3}-[\w]{12}[/]{0,1}$",
-                self.directory,
-            ).group("directory")
-        except re.error:
-            pass
-        try:
-            return re.search(r"^.*/(?P<directory>.*)/$", self.directory).group(
-                "directory"
-            )
-        except re.error:
-            pass
+        match = UUID_SUFFIXED_DIRECTORY_REGEX.search(self.directory)
+        if match is None:
+            match = TRAILING_SLASH_DIRECTORY_REGEX.search(self.directory)
+        if match is not None:
+            return match.group("directory")
 
 
 class Task(models.Model):
@@ -664,6 +658,12 @@ class Task(models.Model):
         db_table = "Tasks"
 
 
+@functools.cache
+def _default_agents_query(*pks):
+    # Q objects are not mutated by filter(), so one instance can be shared.
+    return models.Q(pk__in=pks)
+
+
 class AgentManager(models.Manager):
     # These are set in the 0002_initial_data.py migration of the dashboard
     DEFAULT_SYSTEM_AGENT_PK = 1
@@ -677,8 +677,8 @@ class AgentManager(models.Manager):
 
     def default_agents_query_keywords(self):
         """Return QuerySet keyword arguments for the default agents."""
-        return models.Q(
-            pk__in=(self.DEFAULT_SYSTEM_AGENT_PK, self.DEFAULT_ORGANIZATION_AGENT_PK)
+        return _default_agents_query(
+            self.DEFAULT_SYSTEM_AGENT_PK, self.DEFAULT_ORGANIZATION_AGENT_PK
         )
 
 
@@ -1000,7 +1000,7 @@ def delete_rights_statement(sender, **kwargs):
     instance = kwargs.get("instance")
     try:
         # If the statement has no other RightsGranted delete the RightsStatement
-        if not instance.rightsstatement.rightsstatementrightsgranted_set.all():
+        if not instance.rightsstatement.rightsstatementrightsgranted_set.exists():
             instance.rightsstatement.delete()
     except RightsStatement.DoesNotExist:
         # The RightsGranted is being deleted as part of a cascasde delete from the RightsStatement
@@ -1248,7 +1248,7 @@ class UnitVariable(models.Model):
         help_text=_("Semantically a foreign key to SIP or Transfer"),
         db_column="unitUUID",
     )
-    variable = models.TextField(null=True, db_column="variable")
+    variable = models.CharField(max_length=255, null=True, db_column="variable")
     variablevalue = models.TextField(null=True, db_column="variableValue")
     microservicechainlink = models.UUIDField(
         null=True, blank=True, db_column="microServiceChainLink", default=uuid.uuid4
@@ -1260,8 +1260,9 @@ class UnitVariable(models.Model):
 
     class Meta:
         db_table = "UnitVariables"
-        # Fields indexed via raw migration (as they are blobs):
-        # ("unituuid", "unittype", "variable")
+        indexes = [
+            models.Index(fields=["unituuid", "unittype", "variable"]),
+        ]
 
 
 class TransferMetadataSet(models.Model):
@@ -1325,7 +1326,7 @@ class FPCommandOutput(models.Model):
     rule_id = models.UUIDField(editable=False)
 
     def __unicode__(self):
-        return f"<file: {self.file}; rule: {self.rule_id};>"
+        return f"<file: {self.file_id}; rule: {self.rule_id};>"
 
 
 class FileID(models.Model):
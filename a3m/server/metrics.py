@@ -66,10 +66,13 @@ package_queue_length_gauge = Gauge(
 
 
 def skip_if_prometheus_disabled(func):
+    # The setting does not change while the process runs, so check it once
+    # instead of on every call.
+    if settings.PROMETHEUS_ENABLED:
+        return func
+
     @functools.wraps(func)
     def wrapper(*args, **kwds):
-        if settings.PROMETHEUS_ENABLED:
-            return func(*args, **kwds)
         return None
 
     return wrapper
@@ -304,16 +304,20 @@ class Package:
             if filter_subdir:
                 start_path = start_path + filter_subdir
 
+            # Only load the columns used by get_file_replacement_mapping
+            queryset = queryset.only(
+                "uuid", "originallocation", "currentlocation", "filegrpuse"
+            )
+
             files_returned_already = set()
-            if queryset.exists():
-                for file_obj in queryset.iterator():
-                    file_obj_mapped = get_file_replacement_mapping(
-                        file_obj, self.current_path
-                    )
-                    if not os.path.exists(file_obj_mapped.get("%inputFile%")):
-                        continue
-                    files_returned_already.add(file_obj_mapped.get("%inputFile%"))
-                    yield file_obj_mapped
+            for file_obj in queryset.iterator():
+                file_obj_mapped = get_file_replacement_mapping(
+                    file_obj, self.current_path
+                )
+                if not os.path.exists(file_obj_mapped.get("%inputFile%")):
+                    continue
+                files_returned_already.add(file_obj_mapped.get("%inputFile%"))
+                yield file_obj_mapped
 
             for basedir, subdirs, files in os.walk(start_path):
                 for file_name in files:
@@ -58,21 +58,33 @@ class TransferService(transfer_service_api.service_pb2_grpc.TransferServiceServi
         if not request.job_id:
             context.abort(code_pb2.INVALID_ARGUMENT, "job_id is mandatory")
         resp = transfer_service_api.request_response_pb2.ListTasksResponse()
-        for item in Task.objects.filter(job_id=request.job_id):
+        tasks = Task.objects.filter(job_id=request.job_id).values(
+            "taskuuid",
+            "fileuuid",
+            "exitcode",
+            "filename",
+            "execution",
+            "arguments",
+            "stdout",
+            "stderror",
+            "starttime",
+            "endtime",
+        )
+        for item in tasks:
             start_time = timestamp_pb2.Timestamp()
-            start_time.FromDatetime(item.starttime)
+            start_time.FromDatetime(item["starttime"])
             end_time = timestamp_pb2.Timestamp()
-            end_time.FromDatetime(item.endtime)
+            end_time.FromDatetime(item["endtime"])
             resp.tasks.append(
                 transfer_service_api.request_response_pb2.Task(
-                    id=item.pk,
-                    file_id=item.fileuuid,
-                    exit_code=item.exitcode,
-                    filename=item.filename,
-                    execution=item.execution,
-                    arguments=item.arguments,
-                    stdout=item.stdout,
-                    stderr=item.stderror,
+                    id=item["taskuuid"],
+                    file_id=item["fileuuid"],
+                    exit_code=item["exitcode"],
+                    filename=item["filename"],
+                    execution=item["execution"],
+                    arguments=item["arguments"],
+                    stdout=item["stdout"],
+                    stderr=item["stderror"],
                     start_time=start_time,
                     end_time=end_time,
                 )
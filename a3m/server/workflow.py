@@ -14,12 +14,14 @@ classes ``Chain``, ``Link`` and ``WatchedDir``. They have different method
 sets.
 """
 
+import functools
 import json
 import os
 
 from jsonschema import FormatChecker
-from jsonschema import validate
 from jsonschema.exceptions import ValidationError
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 
 from a3m.server.jobs import Job
 from a3m.server.translation import FALLBACK_LANG
@@ -59,8 +61,11 @@ class Workflow:
 
     def _decode_links(self):
         self.links = {}
+        self._initiator = None
         for link_id, link_obj in self._src["links"].items():
-            self.links[link_id] = Link(link_id, link_obj, self)
+            link = self.links[link_id] = Link(link_id, link_obj, self)
+            if self._initiator is None and link.is_initiator:
+                self._initiator = link
 
     def get_links(self):
         return self.links
@@ -69,9 +74,7 @@ class Workflow:
         return self.links[link_id]
 
     def get_initiator(self):
-        for _, link in self.links.items():
-            if link.is_initiator:
-                return link
+        return self._initiator
 
 
 class BaseLink:
@@ -164,19 +167,12 @@ class Link(BaseLink):
         return status_id
 
 
-class WorkflowJSONDecoder(json.JSONDecoder):
-    def decode(self, foo, **kwargs):
-        parsed_json = super().decode(foo, **kwargs)
-        return Workflow(parsed_json)
-
-
 def load(fp):
     """Read JSON document from file-like object, validate and decode it."""
-    blob = fp.read()  # Read once, used twice.
-    _validate(blob)
-    parsed = json.loads(blob, cls=WorkflowJSONDecoder)
+    parsed = json.load(fp)  # Parse once, used twice.
+    _validate(parsed)
 
-    return parsed
+    return Workflow(parsed)
 
 
 def load_default_workflow() -> Workflow:
@@ -188,11 +184,10 @@ class SchemaValidationError(ValidationError):
     """It wraps ``jsonschema.exceptions.ValidationError``."""
 
 
-def _validate(blob):
-    """Decode and validate the JSON document."""
-    try:
-        validate(json.loads(blob), _get_schema(), format_checker=FormatChecker())
-    except ValidationError as err:
+def _validate(parsed):
+    """Validate the decoded JSON document."""
+    err = best_match(_get_validator().iter_errors(parsed))
+    if err is not None:
         raise SchemaValidationError(**err._contents())
 
 
@@ -201,3 +196,17 @@ def _get_schema():
     schema = os.path.join(ASSETS_DIR, _LATEST_SCHEMA)
     with open(schema) as fp:
         return json.load(fp)
+
+
+@functools.cache
+def _get_validator():
+    """Build the validator for the default schema once per process.
+
+    ``jsonschema.validate`` checks the schema against its meta-schema and
+    builds a new validator on every call, which is wasted work given that our
+    schema never changes at runtime.
+    """
+    schema = _get_schema()
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema, format_checker=FormatChecker())
@@ -0,0 +1,116 @@
+from uuid import uuid4
+
+import pytest
+from prometheus_client import REGISTRY
+
+from a3m.client import metrics
+from a3m.main.models import SIP
+from a3m.main.models import File
+from a3m.main.models import Transfer
+
+
+def _sample_value(name):
+    return REGISTRY.get_sample_value(name) or 0
+
+
+@pytest.fixture
+def stored_sips():
+    metrics._stored_sips.clear()
+    yield metrics._stored_sips
+    metrics._stored_sips.clear()
+
+
+def test_get_script_names():
+    script_names = metrics._get_script_names()
+
+    assert "normalize" in script_names
+    assert "characterize_file" in script_names
+
+    # Helper modules that do not define ``call`` are left out.
+    assert "change_names" not in script_names
+    assert "archivematicaCreateMETSRights" not in script_names
+
+
+def test_aip_stored(db, stored_sips):
+    sip = SIP.objects.create(uuid=str(uuid4()), currentpath="%sharedPath%sip/")
+    for i in range(3):
+        File.objects.create(
+            uuid=str(uuid4()), sip=sip, currentlocation=f"%SIPDirectory%{i}"
+        )
+    stored = _sample_value("mcpclient_aips_stored_total")
+    files_count = _sample_value("mcpclient_aip_files_stored_count")
+    files_sum = _sample_value("mcpclient_aip_files_stored_sum")
+    processing_count = _sample_value("mcpclient_aip_processing_seconds_count")
+
+    metrics.aip_stored.__wrapped__(sip.uuid, 1024)
+
+    assert _sample_value("mcpclient_aips_stored_total") == stored + 1
+    assert _sample_value("mcpclient_aip_files_stored_count") == files_count + 1
+    assert _sample_value("mcpclient_aip_files_stored_sum") == files_sum + 3
+    assert (
+        _sample_value("mcpclient_aip_processing_seconds_count") == processing_count + 1
+    )
+
+
+def test_aip_stored_skips_repeated_sip(db, stored_sips):
+    sip = SIP.objects.create(uuid=str(uuid4()), currentpath="%sharedPath%sip/")
+    stored = _sample_value("mcpclient_aips_stored_total")
+    size_count = _sample_value("mcpclient_aip_size_bytes_count")
+
+    metrics.aip_stored.__wrapped__(sip.uuid, 1024)
+    metrics.aip_stored.__wrapped__(sip.uuid, 1024)
+
+    assert _sample_value("mcpclient_aips_stored_total") == stored + 1
+    assert _sample_value("mcpclient_aip_size_bytes_count") == size_count + 1
+    assert stored_sips == {str(sip.uuid)}
+
+
+def test_transfer_completed(db):
+    transfer = Transfer.objects.create(
+        uuid=str(uuid4()), currentlocation="%sharedPath%transfer/"
+    )
+    for i, size in enumerate((100, 200, 300)):
+        File.objects.create(
+            uuid=str(uuid4()),
+            transfer=transfer,
+            currentlocation=f"%transferDirectory%{i}",
+            size=size,
+        )
+    files_count = _sample_value("mcpclient_transfer_files_count")
+    files_sum = _sample_value("mcpclient_transfer_files_sum")
+    size_sum = _sample_value("mcpclient_transfer_size_bytes_sum")
+
+    metrics.transfer_completed.__wrapped__(transfer.uuid)
+
+    assert _sample_value("mcpclient_transfer_files_count") == files_count + 1
+    assert _sample_value("mcpclient_transfer_files_sum") == files_sum + 3
+    assert _sample_value("mcpclient_transfer_size_bytes_sum") == size_sum + 600
+
+
+def test_transfer_completed_without_files(db):
+    transfer = Transfer.objects.create(
+        uuid=str(uuid4()), currentlocation="%sharedPath%transfer/"
+    )
+    completed = _sample_value("mcpclient_transfer_completed_total")
+    files_count = _sample_value("mcpclient_transfer_files_count")
+    files_sum = _sample_value("mcpclient_transfer_files_sum")
+    size_count = _sample_value("mcpclient_transfer_size_bytes_count")
+    size_sum = _sample_value("mcpclient_transfer_size_bytes_sum")
+
+    metrics.transfer_completed.__wrapped__(transfer.uuid)
+
+    assert _sample_value("mcpclient_transfer_completed_total") == completed + 1
+    assert _sample_value("mcpclient_transfer_files_count") == files_count + 1
+    assert _sample_value("mcpclient_transfer_files_sum") == files_sum
+    assert _sample_value("mcpclient_transfer_size_bytes_count") == size_count + 1
+    assert _sample_value("mcpclient_transfer_size_bytes_sum") == size_sum
+
+
+def test_transfer_completed_unknown_transfer(db):
+    completed = _sample_value("mcpclient_transfer_completed_total")
+    files_count = _sample_value("mcpclient_transfer_files_count")
+
+    metrics.transfer_completed.__wrapped__(str(uuid4()))
+
+    assert _sample_value("mcpclient_transfer_completed_total") == completed
+    assert _sample_value("mcpclient_transfer_files_count") == files_count
@@ -0,0 +1,135 @@
+import os
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from a3m.client.clientScripts import normalize
+from a3m.client.job import Job
+from a3m.main.models import SIP
+from a3m.main.models import File
+
+
+@pytest.fixture
+def sip(db, tmp_path):
+    sip_dir = tmp_path / "sip"
+    (sip_dir / "objects" / "manualNormalization").mkdir(parents=True)
+
+    return SIP.objects.create(uuid=uuid4(), currentpath=f"{sip_dir}/")
+
+
+@pytest.fixture
+def normalization_csv(sip):
+    return os.path.join(
+        sip.currentpath, "objects", "manualNormalization", "normalization.csv"
+    )
+
+
+@pytest.fixture
+def opts(sip):
+    return SimpleNamespace(
+        sip_path=sip.currentpath,
+        sip_uuid=str(sip.uuid),
+        file_path=os.path.join(sip.currentpath, "objects", "image.jpg"),
+    )
+
+
+@pytest.fixture
+def original_file():
+    return {"originallocation": "%SIPDirectory%objects/image.jpg"}
+
+
+def test_check_manual_normalization_match_before_malformed_row(
+    sip, normalization_csv, opts, original_file
+):
+    preservation_file = File.objects.create(
+        uuid=str(uuid4()),
+        sip=sip,
+        originallocation="%SIPDirectory%objects/manualNormalization/preservation/image.tif",
+        currentlocation="%SIPDirectory%objects/manualNormalization/preservation/image.tif",
+    )
+    with open(normalization_csv, "w") as f:
+        f.write("#original,access,preservation\n")
+        f.write("image.jpg,image.jpg,image.tif\n")
+        f.write("malformed,row\n")
+    job = Job("stub", "stub", [])
+
+    result = normalize.check_manual_normalization(job, opts, original_file)
+
+    assert result.uuid == preservation_file.uuid
+    assert "matches entry in normalization.csv" in job.get_stdout()
+
+
+def test_check_manual_normalization_csv_error_before_match(
+    normalization_csv, opts, original_file
+):
+    with open(normalization_csv, "w") as f:
+        f.write("other.jpg,other.jpg,other.tif\n")
+        f.write("x" * (200 * 1024) + "\n")
+        f.write("image.jpg,image.jpg,image.tif\n")
+    job = Job("stub", "stub", [])
+
+    result = normalize.check_manual_normalization(job, opts, original_file)
+
+    assert result is None
+    assert "Error reading" in job.get_stderr()
+
+
+def test_check_manual_normalization_malformed_row_before_match(
+    normalization_csv, opts, original_file
+):
+    with open(normalization_csv, "w") as f:
+        f.write("malformed,row\n")
+        f.write("image.jpg,image.jpg,image.tif\n")
+    job = Job("stub", "stub", [])
+
+    with pytest.raises(ValueError):
+        normalize.check_manual_normalization(job, opts, original_file)
+
+
+def test_check_manual_normalization_undecodable_csv(
+    normalization_csv, opts, original_file
+):
+    with open(normalization_csv, "wb") as f:
+        f.write(b"image.jpg,image.jpg,image\xff.tif\n")
+    job = Job("stub", "stub", [])
+
+    with pytest.raises(UnicodeDecodeError):
+        normalize.check_manual_normalization(job, opts, original_file)
+
+
+def test_check_manual_normalization_prefers_shortest_path(sip, opts, original_file):
+    preservation_dir = "%SIPDirectory%objects/manualNormalization/preservation"
+    # "image-a.tif" is longer than "image.tif" but sorts before it.
+    for name in ("image-a.tif", "image_1.tif", "image.tif"):
+        File.objects.create(
+            uuid=str(uuid4()),
+            sip=sip,
+            originallocation=f"{preservation_dir}/{name}",
+            currentlocation=f"{preservation_dir}/{name}",
+        )
+    job = Job("stub", "stub", [])
+
+    result = normalize.check_manual_normalization(job, opts, original_file)
+
+    assert result.currentlocation == f"{preservation_dir}/image.tif"
+
+
+def test_read_normalization_csv_is_refreshed_when_modified(normalization_csv):
+    with open(normalization_csv, "w") as f:
+        f.write("image.jpg,image.jpg,image.tif\n")
+    mtime_ns = os.stat(normalization_csv).st_mtime_ns
+
+    mapping, error = normalize._read_normalization_csv(normalization_csv, mtime_ns)
+    assert mapping == {"image.jpg": "image.tif"}
+    assert error is None
+
+    with open(normalization_csv, "w") as f:
+        f.write("image.jpg,image.jpg,image.png\n")
+    os.utime(normalization_csv, ns=(mtime_ns + 1_000_000, mtime_ns + 1_000_000))
+
+    mapping, error = normalize._read_normalization_csv(
+        normalization_csv, os.stat(normalization_csv).st_mtime_ns
+    )
+    assert mapping == {"image.jpg": "image.png"}
+    assert error is None
@@ -58,6 +58,12 @@ def test_replacementdict_replace():
     assert d.replace("%PREFIX%/bin/") == ["/usr/local/bin/"]
 
 
+def test_replacementdict_replace_multiple():
+    d = ReplacementDict({"%foo%": "%bar%", "%bar%": "baz"})
+    assert d.replace("%foo%/%bar%", None) == ["%bar%/baz", None]
+    assert ReplacementDict().replace("%foo%") == ["%foo%"]
+
+
 def test_replacementdict_model_constructor_transfer():
     rd = ReplacementDict.frommodel(sip=TRANSFER, file_=FILE, type_="transfer")
 
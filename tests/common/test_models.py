@@ -0,0 +1,28 @@
+import pytest
+
+from a3m.main import models
+
+SIP_UUID = "c58794fd-4fb8-42a0-b9be-e75191696ab8"
+
+
+@pytest.mark.parametrize(
+    "directory,expected",
+    [
+        (
+            "%sharedPath%currentlyProcessing/foo-ee61d09b-2790-4980-827a-135346657eec/",
+            "foo",
+        ),
+        (
+            "%sharedPath%currentlyProcessing/foo-ee61d09b-2790-4980-827a-135346657eec",
+            "foo",
+        ),
+        ("%sharedPath%currentlyProcessing/foo/", "foo"),
+        ("%sharedPath%currentlyProcessing/foo", None),
+        ("", SIP_UUID),
+    ],
+    ids=["uuid_suffix", "uuid_suffix_no_slash", "trailing_slash", "no_match", "empty"],
+)
+def test_job_get_directory_name(directory, expected):
+    job = models.Job(sipuuid=SIP_UUID, directory=directory)
+
+    assert job.get_directory_name() == expected
@@ -1,8 +1,11 @@
+import json
 import os
 from io import StringIO
 
 import pytest
 from django.utils.translation import gettext_lazy
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 
 from a3m.server import translation
 from a3m.server import workflow
@@ -89,6 +92,16 @@ def test_link_browse_methods(mocker):
     assert ln.get_status_id(code="1") == workflow._STATUSES["Failed"]
 
 
+def test_get_initiator():
+    with open(os.path.join(ASSETS_DIR, "workflow.json")) as fp:
+        wf = workflow.load(fp)
+    initiator = wf.get_initiator()
+    assert initiator.is_initiator
+    assert [link for link in wf.get_links().values() if link.is_initiator][0] is (
+        initiator
+    )
+
+
 def test_get_schema():
     schema = workflow._get_schema()
     assert schema["$id"] == "https://a3m.readthedocs.io/workflow/schema/v1.json"
@@ -98,3 +111,15 @@ def test_get_schema_not_found(mocker):
     mocker.patch("a3m.server.workflow._LATEST_SCHEMA", "non-existen-schema")
     with pytest.raises(IOError):
         workflow._get_schema()
+
+
+def test_load_invalid_document_reports_best_match():
+    document = {"links": {"foo": {}}, "watched_directories": 1}
+    with open(os.path.join(ASSETS_DIR, "workflow-schema-v1.json")) as fp:
+        schema = json.load(fp)
+    expected = best_match(validator_for(schema)(schema).iter_errors(document))
+
+    with pytest.raises(workflow.SchemaValidationError) as excinfo:
+        workflow.load(StringIO(json.dumps(document)))
+
+    assert excinfo.value.message == expected.message
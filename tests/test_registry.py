@@ -34,6 +34,20 @@ def test_registry_get_file_rules(db, registry):
     assert len(registry.get_file_rules(file_obj, RulePurpose.THUMBNAIL)) == 1
 
 
+def test_registry_get_file_rules_unidentified_file(db, registry):
+    file_obj = File.objects.create(uuid=uuid.uuid4())
+    assert registry.get_file_rules(file_obj.uuid, RulePurpose.THUMBNAIL) == []
+
+    with pytest.raises(File.DoesNotExist):
+        registry.get_file_rules(uuid.uuid4(), RulePurpose.THUMBNAIL)
+
+
+def test_registry_get_format_version_rules(registry):
+    format_version_id = uuid.UUID("082f3282-8331-4da4-b452-632b17e90d66")  # fmt/3
+    assert len(registry.get_format_version_rules([format_version_id], "thumbnail")) == 1
+    assert registry.get_format_version_rules([], RulePurpose.THUMBNAIL) == []
+
+
 def test_registry_integrity(registry):
     """Validates the integrity of the registry.
 
@@ -77,3 +91,20 @@ def test_registry_integrity(registry):
             assert (
                 rule.format.enabled and rule.format.id not in backend.replaced_versions
             ), f"Rule in service {rule.id} is using a FormatVersion not in service: {rule.format} ({rule.format.description})."
+
+
+def test_registry_get_rules_matches_full_scan(registry):
+    """The rules index must agree with a scan over every rule."""
+    backend: JSONBackend = registry.backend
+
+    for version_id in backend.versions:
+        for purpose in RulePurpose:
+            expected = [
+                rule
+                for rule in backend.rules.values()
+                if rule.format.id == version_id
+                and rule.purpose == purpose
+                and rule.enabled
+                and rule.id not in backend.replaced_rules
+            ]
+            assert registry.get_rules(version_id, purpose) == expected